@@ -1,24 +1,28 @@
 from game import Client
+import sys
 
 
 def main():
     """
     This script will launch the guest of the game.
     Must be executed after the server is up (server.py).
+    The host's IP can be given as first argument, defaults to this machine.
     """
-    client = Client()
+    client = Client(sys.argv[1] if len(sys.argv) > 1 else "")
 
     while True:  # main loop
 
         if client.start_playing():
             client.player.display_info()
             client.player.display()
-        else:
-            client.await_move()
+        elif not client.await_move():
+            client.game_over()
+            break
 
         while True:  # game loop
             move = int(input(f"Enter next move: "))
-            client.send_move(move)
+            while not client.send_move(move):
+                move = int(input("Invalid move, enter another one: "))
 
             if not client.continue_game():
                 break
@@ -26,7 +30,8 @@ def main():
             if not client.await_move():
                 break
 
-        client.game_over()
+        if not client.game_over():
+            break
 
         if not client.rematch():
             break
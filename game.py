@@ -1,8 +1,22 @@
 import os
+import sys
 import socket
-import pickle
 import numpy as np
-from scipy.signal import convolve
+
+# ANSI escape: clear the screen and move the cursor home
+CLEAR = "\x1b[2J\x1b[H"
+
+if os.name == "nt":
+    # Running any command once turns on escape code processing in the Windows console
+    os.system("")
+
+# The client connects to this machine unless given the host's IP, no DNS lookup needed
+DEFAULT_HOST = "127.0.0.1"
+
+# Board cells hold the index of their symbol: 0 = empty, 1 = "X", 2 = "O"
+SYMBOLS = " XO"
+# Same, as an array to translate the whole board with a single fancy-index
+SYMBOL_TABLE = np.array(list(SYMBOLS))
 
 
 class Connect4:
@@ -30,9 +44,28 @@ class Connect4:
 
         self.player = player
         self.opponent = "O" if player == "X" else "X"
-
-        self.board = np.zeros(grid_size, dtype=str)
-        self.board[:] = " "
+        # Board codes of both players
+        self._pcode = SYMBOLS.index(player)
+        self._ocode = SYMBOLS.index(self.opponent)
+
+        self.board = np.zeros(grid_size, dtype=np.uint8)
+        # Number of pieces on each column, so the landing row is known without a scan
+        self.heights = [0] * grid_size[1]
+        # Pieces placed by both players (self.turn only counts ours)
+        self.pieces = 0
+
+        # Our pieces as a bitboard: cell (row, col) is bit row * (ncols + 1) + col.
+        # The extra (always empty) bit column keeps rows from wrapping into each other.
+        self.bitboard = 0
+        # Bit distance between neighbouring cells, and twice it:
+        # horizontal, rl diagonal, vertical, lr diagonal
+        ncol = grid_size[1]
+        self._shifts = tuple((d, 2 * d) for d in (1, ncol, ncol + 1, ncol + 2))
+
+        # Board decorations only depend on the grid size, build them once
+        self._header = "   " + "  ║  ".join(map(str, range(grid_size[1])))
+        self._sep = " ═════" + "╬═════" * (grid_size[1] - 1)
+        self._row_tpl = "   " + "  ║  ".join(["{}"] * grid_size[1])
 
     def make_move(self, col: int) -> bool:
         """
@@ -44,15 +77,19 @@ class Connect4:
         Returns:
             bool: True if the move is valid, False else.
         """
-        ncol = self.grid_size[1]
+        nrow, ncol = self.grid_size
 
-        if col >= ncol:
+        if not 0 <= col < ncol:
             # check for valid input
             return False
 
-        if (idx := (self.board[self.board[:, col] == " ", col]).size) > 0:
+        if (height := self.heights[col]) < nrow:
             # check for free space on col
-            self.board[idx - 1, col] = self.player
+            row = nrow - 1 - height
+            self.board[row, col] = self._pcode
+            self.bitboard |= 1 << (row * (ncol + 1) + col)
+            self.heights[col] += 1
+            self.pieces += 1
             self.turn += 1
             return True
 
@@ -61,50 +98,48 @@ class Connect4:
     def update_game(self, opponent_move: int) -> bool:
         """
         Applies a move on the selected column for our opponent.
-        No check for validity needed as it has already been checked
-        on the other player's Connect4 object before sending.
+        The move has already been checked on the other player's Connect4 object
+        before sending; it is checked again here in case both boards got out of sync.
 
         Args:
             opponent_move (int): Column selected by the other player.
 
         Returns:
-            bool: True if correctly updated. Should never return False.
+            bool: True once updated.
+
+        Raises:
+            ValueError: If the column is out of the board or already full.
         """
-        # Try clause has almost zero cost if no exception is catched
-        try:
-            idx = (self.board[self.board[:, opponent_move] == " ", opponent_move]).size
-            self.board[idx - 1, opponent_move] = self.opponent
-        except Exception:
-            return False
-        else:
-            return True
+        nrow, ncol = self.grid_size
+
+        if not 0 <= opponent_move < ncol:
+            raise ValueError(f"column {opponent_move} is out of the board")
+        if (height := self.heights[opponent_move]) >= nrow:
+            raise ValueError(f"column {opponent_move} is full")
+
+        self.board[nrow - 1 - height, opponent_move] = self._ocode
+        self.heights[opponent_move] += 1
+        self.pieces += 1
+        return True
 
     def check_win(self) -> bool:
         """
-        Checks whether you've won the game or not. It uses convolution (FFT)
-        between the board and basic solution kernels in order to check superposition.
-        If the superposition of a kernel with the board reaches 4, the game ends.
+        Checks whether you've won the game or not. For each direction, shifting the
+        bitboard by the distance between two neighbouring cells and ANDing it with
+        itself leaves the pieces with a neighbour; doing it again with twice the
+        distance leaves only the pieces starting a line of 4.
 
         Returns:
             bool: True if we win, False else.
         """
+        if self.turn <= 4:
+            # less than 4 pieces of ours on the board
+            return False
 
-        # We create a zeros matrix that will contain a 1 where out pieces are placed
-        b = np.zeros(self.grid_size)
-        b[self.board == self.player] = 1
-
-        # KERNELS (basic solutions)
-        kernels = (
-            np.array([[1], [1], [1], [1]]),  # vertical
-            np.array([[1, 1, 1, 1]]),  # horizontal
-            np.eye(4, dtype=int),  # lr diagonal
-            np.eye(4, dtype=int)[::-1],  # rl diagonal
-        )
-
-        # If convolution reaches 4 => complete kernel-board superpos.
-        for kernel in kernels:
-            c = convolve(b, kernel)
-            if any(c[c == 4]):
+        bb = self.bitboard
+        for d, d2 in self._shifts:
+            y = bb & (bb >> d)
+            if y & (y >> d2):
                 return True
         return False
 
@@ -116,20 +151,17 @@ class Connect4:
         Returns:
             bool: True if there is no free space, False else.
         """
-        if np.count_nonzero(self.board) > 0:
-            return False
-        return True
+        return self.pieces >= self.grid_size[0] * self.grid_size[1]
 
     def display(self) -> None:
         """
         Will display the current gameboard. First the board is converted into a str,
         and the printed only once to improve speed.
         """
-        board = []
-        board.append("   " + "  ║  ".join(map(str, range(self.grid_size[1]))))  # header
-        for row in self.board:
-            board.append(" ═════" + "╬═════" * (self.grid_size[1] - 1))
-            board.append("   " + "  ║  ".join(row))
+        board = [self._header]
+        for row in SYMBOL_TABLE[self.board].tolist():
+            board.append(self._sep)
+            board.append(self._row_tpl.format(*row))
         print("\n".join(board) + "\n\n")
 
     def display_info(self) -> None:
@@ -143,73 +175,91 @@ class Connect4:
         Restarts the turn count and the gameboard.
         """
         self.turn = 1
-        self.board[:] = " "
+        self.board[:] = 0
+        self.heights = [0] * self.grid_size[1]
+        self.pieces = 0
+        self.bitboard = 0
 
 
 class Client:
     def __init__(self, host_ip: str = "") -> None:
-        HOST_IP = host_ip if host_ip else socket.gethostbyname(socket.gethostname())
+        HOST_IP = host_ip if host_ip else DEFAULT_HOST
         PORT = 12783
         self.serv = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
         self.serv.connect((HOST_IP, PORT))
-        self.STATUS = "-p"
+        # Moves are tiny and interactive, don't let Nagle hold them back
+        self.serv.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self._buf = memoryview(bytearray(16))
+        self.STATUS = b"p"
+        self._move = None  # last accepted move, see send_move
         print(f"\nConnected to {self.serv.getsockname()}!")
 
+    def _recv_exact(self, n: int) -> memoryview:
+        # The returned view is overwritten by the next call
+        view = self._buf[:n]
+        if self.serv.recv_into(view, n, socket.MSG_WAITALL) < n:
+            raise ConnectionError("The other player disconnected.")
+        return view
+
     def start_playing(self) -> bool:
-        # if the player == -x, is the first one playing
-        first = pickle.loads(self.serv.recv(1024)) == "-x"
+        # if the player == x, is the first one playing
+        first = self._recv_exact(1) == b"x"
+        self.STATUS = b"p"
 
         if first:
             print("You play first as 'X'")
             self.player = Connect4("X")
-            self.__self = "-x"
-            self.__opp = "-o"
+            self.__self = b"x"
+            self.__opp = b"o"
         else:
             print("You play second as 'O'")
             self.player = Connect4("O")
-            self.__self = "-o"
-            self.__opp = "-x"
+            self.__self = b"o"
+            self.__opp = b"x"
         return first
 
-    def send_move(self, move: int) -> None:
-        self.player.make_move(move)
-        os.system("cls")
+    def send_move(self, move: int) -> bool:
+        if not self.player.make_move(move):
+            return False
+        sys.stdout.write(CLEAR)
         self.player.display()
-        self.serv.send(pickle.dumps(move))
+        # sent together with the resulting status by continue_game
+        self._move = move
+        return True
 
     def await_move(self) -> bool:
         print(f"\nWaiting for the other player...")
-        opp_move = int(pickle.loads(self.serv.recv(1024)))
-        self.player.update_game(opp_move)
-        self.STATUS = pickle.loads(self.serv.recv(1024))
+        try:
+            msg = self._recv_exact(2)  # (move, status)
+        except ConnectionError:
+            self.STATUS = b"q"  # the opponent quit, see game_over
+            return False
+        self.player.update_game(msg[0])
+        self.STATUS = bytes(msg[1:])
 
-        os.system("cls")
+        sys.stdout.write(CLEAR)
 
         self.player.display_info()
         self.player.display()
 
-        if self.STATUS in (self.__opp, "-d"):
+        if self.STATUS in (self.__opp, b"d"):
             return False
         return True
 
     def continue_game(self) -> bool:
         if self.player.check_win():
             self.STATUS = self.__self
-            self.serv.send(pickle.dumps(self.STATUS))
-            return False
-
         elif self.player.check_game_over():
-            self.STATUS = "-d"
-            self.serv.send(pickle.dumps(self.STATUS))
-            return False
+            self.STATUS = b"d"
 
-        self.serv.send(pickle.dumps(self.STATUS))
-        return True
+        # a single 2 bytes message: (move, status)
+        self.serv.send(bytes((self._move,)) + self.STATUS)
+        return self.STATUS == b"p"
 
     def game_over(self) -> bool:
         if self.STATUS == self.__self:
             print(f"Congrats, you won in {self.player.turn - 1} turns!")
-        elif self.STATUS == "-d":
+        elif self.STATUS == b"d":
             print("It's a draw!")
         elif self.STATUS == self.__opp:
             print("Sorry, the opponent won.")
@@ -220,16 +270,16 @@ class Client:
 
     def rematch(self) -> bool:
         print(f"\nWaiting for host...")
-        host_response = pickle.loads(self.serv.recv(1024))
+        host_response = bytes(self._recv_exact(1))
 
         # if the host wants a rematch, then the client is asked
-        if host_response == "N":
+        if host_response == b"N":
             print(f"\nThe host does not want a rematch.")
             return False
 
         print(f"\nThe host would like a rematch!")
         client_response = input("Rematch? (Y/N): ").capitalize()
-        self.serv.send(pickle.dumps(client_response))
+        self.serv.send(b"N" if client_response == "N" else b"Y")
 
         # if the client wants a rematch, restart the game
         if client_response == "N":
@@ -245,73 +295,87 @@ class Client:
 
 class Server:
     def __init__(self) -> None:
-        HOST_IP = socket.gethostbyname(socket.gethostname())
         PORT = 12783
 
         self.serv = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        self.serv.bind((HOST_IP, PORT))
+        self.serv.bind(("0.0.0.0", PORT))  # reachable on every interface
         self.serv.listen(5)
-        self.STATUS = "-p"
+        self.STATUS = b"p"
+        self._move = None  # last accepted move, see send_move
 
         self.player = Connect4("X")
 
         self.client_socket, client_address = self.serv.accept()
+        # Moves are tiny and interactive, don't let Nagle hold them back
+        self.client_socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self._buf = memoryview(bytearray(16))
         print(f"\nConnected to {client_address}!")
 
+    def _recv_exact(self, n: int) -> memoryview:
+        # The returned view is overwritten by the next call
+        view = self._buf[:n]
+        if self.client_socket.recv_into(view, n, socket.MSG_WAITALL) < n:
+            raise ConnectionError("The other player disconnected.")
+        return view
+
     def start_playing(self, first: bool) -> None:
+        self.STATUS = b"p"
         if first:
             print("You play first as 'X'")
             self.player = Connect4("X")
-            self.__self = "-x"
-            self.__opp = "-o"
+            self.__self = b"x"
+            self.__opp = b"o"
         else:
             print("You play second as 'O'")
             self.player = Connect4("O")
-            self.__self = "-o"
-            self.__opp = "-x"
+            self.__self = b"o"
+            self.__opp = b"x"
 
-        self.client_socket.send(pickle.dumps(self.__opp))
+        self.client_socket.send(self.__opp)
 
-    def send_move(self, move: int) -> None:
-        self.player.make_move(move)
-        os.system("cls")
+    def send_move(self, move: int) -> bool:
+        if not self.player.make_move(move):
+            return False
+        sys.stdout.write(CLEAR)
         self.player.display()
-        self.client_socket.send(pickle.dumps(move))
+        # sent together with the resulting status by continue_game
+        self._move = move
+        return True
 
     def await_move(self) -> bool:
         print(f"\nWaiting for the other player...")
 
-        opp_move = int(pickle.loads(self.client_socket.recv(1024)))
-        self.player.update_game(opp_move)
-        self.STATUS = pickle.loads(self.client_socket.recv(1024))
+        try:
+            msg = self._recv_exact(2)  # (move, status)
+        except ConnectionError:
+            self.STATUS = b"q"  # the opponent quit, see game_over
+            return False
+        self.player.update_game(msg[0])
+        self.STATUS = bytes(msg[1:])
 
-        os.system("cls")
+        sys.stdout.write(CLEAR)
 
         self.player.display_info()
         self.player.display()
 
-        if self.STATUS in (self.__opp, "-d"):
+        if self.STATUS in (self.__opp, b"d"):
             return False
         return True
 
     def continue_game(self) -> bool:
         if self.player.check_win():
             self.STATUS = self.__self
-            self.client_socket.send(pickle.dumps(self.STATUS))
-            return False
-
         elif self.player.check_game_over():
-            self.STATUS = "-d"
-            self.client_socket.send(pickle.dumps(self.STATUS))
-            return False
+            self.STATUS = b"d"
 
-        self.client_socket.send(pickle.dumps(self.STATUS))
-        return True
+        # a single 2 bytes message: (move, status)
+        self.client_socket.send(bytes((self._move,)) + self.STATUS)
+        return self.STATUS == b"p"
 
     def game_over(self) -> bool:
         if self.STATUS == self.__self:
             print(f"Congrats, you won in {self.player.turn - 1} turns!")
-        elif self.STATUS == "-d":
+        elif self.STATUS == b"d":
             print("It's a draw!")
         elif self.STATUS == self.__opp:
             print("Sorry, the opponent won.")
@@ -322,15 +386,15 @@ class Server:
 
     def rematch(self) -> bool:
         host_response = input(f"\nRematch? (Y/N): ").capitalize()
-        self.client_socket.send(pickle.dumps(host_response))
+        self.client_socket.send(b"N" if host_response == "N" else b"Y")
 
         if host_response == "N":
             return False
 
         print("Waiting for the client to response...")
-        client_response = pickle.loads(self.client_socket.recv(1024))
+        client_response = bytes(self._recv_exact(1))
 
-        if client_response == "N":
+        if client_response == b"N":
             print("\nThe client does not want a rematch.")
             return False
 
@@ -17,12 +17,14 @@ def main():
         if first:
             server.player.display_info()
             server.player.display()
-        else:
-            server.await_move()
+        elif not server.await_move():
+            server.game_over()
+            break
 
         while True:  # game loop
             move = int(input(f"Enter next move: "))
-            server.send_move(move)
+            while not server.send_move(move):
+                move = int(input("Invalid move, enter another one: "))
 
             if not server.continue_game():
                 break
@@ -30,7 +32,8 @@ def main():
             if not server.await_move():
                 break
 
-        server.game_over()
+        if not server.game_over():
+            break
 
         if not server.rematch():
             break